@@ -5,6 +5,7 @@ parse_network.py
 Resolve LZA network-config.yaml by applying values from replacements-config.yaml,
 then output a JSON file with:
   - resolved_network_config: the fully-resolved raw config
+    (omitted with --no-resolved-config)
   - graph: a normalized network graph (VPCs, subnets, TGWs, etc.)
 
 Usage (from your project folder):
@@ -16,16 +17,35 @@ Usage (from your project folder):
 
 import argparse
 import json
+import re
+import sys
+from dataclasses import dataclass, fields, is_dataclass
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, List, Optional
 
 import yaml
 
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib json encoder
+    orjson = None
+
+# Prefer the libyaml-backed loader when available; it accepts the same safe
+# subset as yaml.SafeLoader but parses large configs several times faster.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Matches {{Key}} with at most one space on either side of the key, i.e.
+# {{ Key }}, {{Key}}, {{ Key}} and {{Key }} (group 1), and ${Key} (group 2).
+# A key is any run of non-whitespace, non-brace characters, so hyphenated LZA
+# keys (e.g. Subnet-Endpoint-A) match but keys containing spaces never do.
+PLACEHOLDER_RE = re.compile(r"\{\{ ?([^{}\s]+) ?\}\}|\$\{([^{}\s]+)\}")
+
 
 def load_yaml(path: Path):
     """Load a YAML file and return the parsed Python object."""
     with path.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=YAML_LOADER)
 
 
 def build_replacements(replacements_raw: dict) -> dict:
@@ -35,7 +55,7 @@ def build_replacements(replacements_raw: dict) -> dict:
         "AcceleratorPrefix": "AWSAccelerator",
         "AcceleratorHomeRegion": "ca-central-1",
         "VpcEndpointCidr": "10.235.0.0/22",
-        "SandboxAllowedRegions": ["ca-central-1", "us-east-1", ...],
+        "SandboxAllowedRegions": "ca-central-1,us-east-1,...",
         ...
       }
 
@@ -44,6 +64,8 @@ def build_replacements(replacements_raw: dict) -> dict:
         - key: ...
           type: String | StringList
           value: ...
+
+    StringList values are joined with commas, so every value is a string.
     """
     if not isinstance(replacements_raw, dict):
         return {}
@@ -66,10 +88,10 @@ def build_replacements(replacements_raw: dict) -> dict:
             continue
 
         if type_ == "StringList":
-            # Ensure value is stored as a list
+            # Store lists pre-joined, the way they are rendered into the config
             if not isinstance(value, list):
                 value = [value] if value is not None else []
-            mapping[str(key)] = value
+            mapping[str(key)] = ",".join(str(v) for v in value)
         else:
             # Everything else is stored as a simple string
             mapping[str(key)] = "" if value is None else str(value)
@@ -77,6 +99,45 @@ def build_replacements(replacements_raw: dict) -> dict:
     return mapping
 
 
+def load_replacements_cached(path: Path) -> dict:
+    """
+    Return build_replacements() for replacements-config.yaml, reusing a JSON
+    sidecar (e.g. replacements-config.cache.json) written on a previous run.
+
+    The sidecar records the YAML's st_mtime_ns and st_size and is only reused
+    when both match exactly; otherwise it is rebuilt. If the sidecar cannot be
+    written (e.g. read-only config checkout), a warning is printed and the
+    freshly built mapping is returned anyway.
+    """
+    cache_path = path.with_suffix(".cache.json")
+    stat = path.stat()
+    source = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    if cache_path.exists():
+        try:
+            with cache_path.open("r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if (
+                isinstance(cached, dict)
+                and cached.get("source") == source
+                and isinstance(cached.get("mapping"), dict)
+            ):
+                return cached["mapping"]
+        except (OSError, ValueError):
+            pass  # Unreadable or corrupt cache: fall through and rebuild it
+
+    mapping = build_replacements(load_yaml(path))
+    try:
+        with cache_path.open("w", encoding="utf-8") as f:
+            json.dump({"source": source, "mapping": mapping}, f)
+    except OSError as exc:
+        print(
+            f"Warning: could not write replacements cache {cache_path}: {exc}",
+            file=sys.stderr,
+        )
+    return mapping
+
+
 def render_network_config(network_path: Path, replacements: dict) -> dict:
     """
     Read network-config.yaml as raw text, replace {{ Key }} / {{Key}} / ${Key}
@@ -84,25 +145,281 @@ def render_network_config(network_path: Path, replacements: dict) -> dict:
 
     This avoids PyYAML choking on un-rendered Jinja-style {{ variables }}.
     """
-    raw_text = network_path.read_text(encoding="utf-8")
+    raw_bytes = network_path.read_bytes()
 
-    for key, value in replacements.items():
-        if isinstance(value, list):
-            replacement_str = ",".join(str(v) for v in value)
-        else:
-            replacement_str = str(value)
+    # Nothing to substitute: hand the bytes straight to the YAML parser and
+    # skip decoding the file to str
+    if not replacements or (b"{{" not in raw_bytes and b"${" not in raw_bytes):
+        return yaml.load(raw_bytes, Loader=YAML_LOADER)
 
-        # Handle Jinja-style with/without spaces:
-        #   {{ AcceleratorHomeRegion }}  or  {{AcceleratorHomeRegion}}
-        raw_text = raw_text.replace(f"{{{{ {key} }}}}", replacement_str)
-        raw_text = raw_text.replace(f"{{{{{key}}}}}", replacement_str)
+    raw_text = raw_bytes.decode("utf-8")
 
-        # Handle ${Key} style
-        raw_text = raw_text.replace(f"${{{key}}}", replacement_str)
+    # Substitute every placeholder in a single pass with the module-level
+    # pattern; unknown keys are left as-is
+    lookup = replacements.get
+    raw_text = PLACEHOLDER_RE.sub(
+        lambda m: lookup(m.group(1) or m.group(2), m.group(0)), raw_text
+    )
 
     # Now the text should no longer contain bare {{ ... }} placeholders
     # Safe to parse as YAML
-    return yaml.safe_load(raw_text)
+    return yaml.load(raw_text, Loader=YAML_LOADER)
+
+
+def first_present(d: dict, *keys, default=None):
+    """
+    Return the first truthy value among d[key] for keys.
+
+    Equivalent to d.get(k1) or d.get(k2) or ..., with "or default" appended
+    when a default is given: if nothing is truthy, the last looked-up value
+    (e.g. "") is returned, or default if one was passed.
+    """
+    get = d.get
+    value = None
+    for key in keys:
+        value = get(key)
+        if value:
+            return value
+    return value if default is None else default
+
+
+# ---- Graph records ----
+#
+# Graph entities are slotted dataclasses rather than dicts: large configs hold
+# thousands of subnets, and a slotted record is a fraction of a dict's size.
+# Field names (and order) are exactly the keys emitted in the JSON graph.
+# __slots__ is spelled out (instead of dataclass(slots=True)) to keep
+# Python 3.7 support.
+
+
+@dataclass
+class TransitGateway:
+    __slots__ = ("id", "name", "account", "region", "asn")
+    id: Optional[str]
+    name: Optional[str]
+    account: Any
+    region: Any
+    asn: Any
+
+
+@dataclass
+class CnfgwEndpoint:
+    __slots__ = ("id", "name", "tgw", "route_table", "destination", "type")
+    id: str
+    name: str
+    tgw: Optional[str]
+    route_table: Optional[str]
+    destination: Any
+    type: str
+
+
+@dataclass
+class Subnet:
+    __slots__ = ("id", "name", "cidr", "az", "type")
+    id: Optional[str]
+    name: Optional[str]
+    cidr: Any
+    az: Any
+    type: Any
+
+
+@dataclass
+class Vpc:
+    __slots__ = ("id", "name", "account", "region", "cidr", "azs", "subnets")
+    id: Optional[str]
+    name: Optional[str]
+    account: Any
+    region: Any
+    cidr: Any
+    azs: List[Any]
+    subnets: List[Subnet]
+
+
+@dataclass
+class TgwAttachment:
+    __slots__ = ("id", "tgw_id", "vpc_id", "name", "subnets", "route_tables")
+    id: Optional[str]
+    tgw_id: Optional[str]
+    vpc_id: Optional[str]
+    name: Optional[str]
+    subnets: List[Any]
+    route_tables: dict
+
+
+@dataclass
+class DxGateway:
+    __slots__ = (
+        "id",
+        "name",
+        "account",
+        "asn",
+        "virtual_interfaces",
+        "tgw_associations",
+    )
+    id: Optional[str]
+    name: Optional[str]
+    account: Any
+    asn: Any
+    virtual_interfaces: List[dict]
+    tgw_associations: List[dict]
+
+
+@dataclass
+class VpnConnection:
+    __slots__ = (
+        "name",
+        "customer_gateway",
+        "account",
+        "region",
+        "transit_gateway",
+        "static_routes_only",
+        "route_table_associations",
+        "route_table_propagations",
+        "tunnel_specifications",
+    )
+    name: Optional[str]
+    customer_gateway: Optional[str]
+    account: Any
+    region: Any
+    transit_gateway: Any
+    static_routes_only: Any
+    route_table_associations: Any
+    route_table_propagations: Any
+    tunnel_specifications: Any
+
+
+def record_to_dict(obj):
+    """
+    json.dump ``default`` hook: turn a graph record into a plain dict.
+
+    Only the top level is converted; the encoder calls back in for nested
+    records (e.g. a Vpc's subnets). orjson serializes dataclasses natively.
+    """
+    if is_dataclass(obj):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def process_vpc(vpc: dict, default_region=None) -> tuple:
+    """
+    Normalize a single VPC entry into its Vpc record and TgwAttachment list.
+    """
+    first = first_present
+
+    vpc_id = vpc.get("name")
+    # Subnet and attachment IDs are "<vpc>-<subnet>"; build the prefix once
+    id_prefix = f"{vpc_id}-" if vpc_id else None
+    account = vpc.get("account", "unknown")
+    region = vpc.get("region", default_region)
+    # Handle both single CIDR and CIDR array
+    cidrs = vpc.get("cidrs", [])
+    if cidrs and isinstance(cidrs, list):
+        cidr = cidrs[0]  # Use first CIDR
+    else:
+        cidr = first(vpc, "cidr", "ipv4CidrBlock", "ipv4Cidr")
+
+    # Subnets
+    subnets = []
+    subnets_append = subnets.append
+    az_set = set()
+    for subnet in vpc.get("subnets", []):
+        if not isinstance(subnet, dict):
+            continue
+        subnet_name = subnet.get("name")
+        if id_prefix and subnet_name:
+            subnet_id = f"{id_prefix}{subnet_name}"
+        else:
+            subnet_id = subnet_name
+
+        subnet_cidr = first(subnet, "cidr", "ipv4CidrBlock", "ipv4Cidr")
+        az = first(subnet, "availabilityZone", "az")
+        if az:
+            az_set.add(az)
+        subnet_type = first(subnet, "type", "subnetType", "tier", default="unknown")
+
+        subnets_append(
+            Subnet(
+                id=subnet_id,
+                name=subnet_name,
+                cidr=subnet_cidr,
+                az=az,
+                type=subnet_type,
+            )
+        )
+
+    vpc_record = Vpc(
+        id=vpc_id,
+        name=vpc.get("name"),
+        account=account,
+        region=region,
+        cidr=cidr,
+        azs=sorted(az_set),
+        subnets=subnets,
+    )
+
+    # TGW Attachments for this VPC
+    attachments = []
+    attachments_append = attachments.append
+    for attachment in vpc.get("transitGatewayAttachments", []):
+        if not isinstance(attachment, dict):
+            continue
+
+        tgw_ref = attachment.get("transitGateway")
+        if isinstance(tgw_ref, dict):
+            tgw_name = tgw_ref.get("name")
+        else:
+            tgw_name = tgw_ref
+        att_name = attachment.get("name") or f"{vpc_id}-{tgw_name}"
+        subnet_names = attachment.get("subnets", [])
+
+        # Map subnet names in the attachment to our constructed subnet IDs
+        if id_prefix:
+            attachment_subnet_ids = [
+                f"{id_prefix}{sn}" if sn else sn for sn in subnet_names
+            ]
+        else:
+            attachment_subnet_ids = list(subnet_names)
+
+        attachments_append(
+            TgwAttachment(
+                id=f"{vpc_id}-{tgw_name}" if vpc_id and tgw_name else att_name,
+                tgw_id=tgw_name,
+                vpc_id=vpc_id,
+                name=att_name,
+                subnets=attachment_subnet_ids,
+                route_tables={
+                    "tgw_association": attachment.get("routeTableAssociations"),
+                    "tgw_propagations": attachment.get(
+                        "routeTablePropagations", []
+                    ),
+                },
+            )
+        )
+
+    return vpc_record, attachments
+
+
+def intern_str(value):
+    """
+    Return sys.intern(value) for plain strings, anything else unchanged.
+
+    account/region/az/type take a handful of distinct values across thousands
+    of records; interning makes the records share one string object each.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+def intern_vpc_strings(vpc_record: Vpc) -> None:
+    """
+    Intern a Vpc record's account/region and its subnets' az/type strings in
+    place. extract_network_graph calls this once per record from process_vpc.
+    """
+    vpc_record.account = intern_str(vpc_record.account)
+    vpc_record.region = intern_str(vpc_record.region)
+    vpc_record.azs = [intern_str(az) for az in vpc_record.azs]
+    for subnet in vpc_record.subnets:
+        subnet.az = intern_str(subnet.az)
+        subnet.type = intern_str(subnet.type)
 
 
 def extract_network_graph(network_cfg: dict) -> dict:
@@ -117,116 +434,57 @@ def extract_network_graph(network_cfg: dict) -> dict:
       - directConnectGateways
     """
 
-    # ---- Transit Gateways ----
     transit_gateways = []
+    cnfgw_endpoints = []
+
+    # The TGW/route-table loop walks every route; bind the list appends and
+    # helper once instead of resolving them on every iteration.
+    first = first_present
+    tgw_append = transit_gateways.append
+    cnfgw_append = cnfgw_endpoints.append
+
+    # ---- Transit Gateways & CNFGW Endpoints ----
     for tgw in network_cfg.get("transitGateways", []):
         if not isinstance(tgw, dict):
             continue
         tgw_id = tgw.get("name")
-        transit_gateways.append(
-            {
-                "id": tgw_id,
-                "name": tgw.get("name"),
-                "account": tgw.get("account"),
-                "region": tgw.get("region"),
-                "asn": tgw.get("asn"),
-            }
-        )
-
-    # ---- VPCs & Subnets ----
-    vpcs = []
-    tgw_attachments = []
-
-    for vpc in network_cfg.get("vpcs", []):
-        if not isinstance(vpc, dict):
-            continue
-
-        vpc_id = vpc.get("name")
-        account = vpc.get("account", "unknown")
-        region = vpc.get("region", network_cfg.get("region", None))
-        # Handle both single CIDR and CIDR array
-        cidrs = vpc.get("cidrs", [])
-        if cidrs and isinstance(cidrs, list):
-            cidr = cidrs[0]  # Use first CIDR
-        else:
-            cidr = vpc.get("cidr") or vpc.get("ipv4CidrBlock") or vpc.get("ipv4Cidr")
-
-        # Subnets
-        subnets = []
-        for subnet in vpc.get("subnets", []):
-            if not isinstance(subnet, dict):
-                continue
-            subnet_name = subnet.get("name")
-            subnet_id = f"{vpc_id}-{subnet_name}" if vpc_id and subnet_name else subnet_name
-
-            subnet_cidr = (
-                subnet.get("cidr")
-                or subnet.get("ipv4CidrBlock")
-                or subnet.get("ipv4Cidr")
-            )
-            az = subnet.get("availabilityZone") or subnet.get("az")
-            subnet_type = (
-                subnet.get("type")
-                or subnet.get("subnetType")
-                or subnet.get("tier")
-                or "unknown"
+        tgw_append(
+            TransitGateway(
+                id=tgw_id,
+                name=tgw.get("name"),
+                account=intern_str(tgw.get("account")),
+                region=intern_str(tgw.get("region")),
+                asn=tgw.get("asn"),
             )
-
-            subnets.append(
-                {
-                    "id": subnet_id,
-                    "name": subnet_name,
-                    "cidr": subnet_cidr,
-                    "az": az,
-                    "type": subnet_type,
-                }
-            )
-
-        vpcs.append(
-            {
-                "id": vpc_id,
-                "name": vpc.get("name"),
-                "account": account,
-                "region": region,
-                "cidr": cidr,
-                "azs": sorted({s["az"] for s in subnets if s.get("az")}),
-                "subnets": subnets,
-            }
         )
 
-        # TGW Attachments for this VPC
-        for attachment in vpc.get("transitGatewayAttachments", []):
-            if not isinstance(attachment, dict):
+        # CNFGW endpoints are discovered from this TGW's route table targets
+        for rt in tgw.get("routeTables", []):
+            if not isinstance(rt, dict):
                 continue
+            for route in rt.get("routes", []):
+                if not isinstance(route, dict):
+                    continue
+                target_endpoint = route.get("targetVpcEndpoint")
+                if target_endpoint and "cnfgw" in target_endpoint.lower():
+                    cnfgw_append(CnfgwEndpoint(
+                        id=target_endpoint,
+                        name=target_endpoint,
+                        tgw=tgw.get("name"),
+                        route_table=rt.get("name"),
+                        destination=first(route, "destinationCidrBlock", "destination"),
+                        type="palo_alto_cnfgw"
+                    ))
 
-            tgw_ref = attachment.get("transitGateway")
-            if isinstance(tgw_ref, dict):
-                tgw_name = tgw_ref.get("name")
-            else:
-                tgw_name = tgw_ref
-            att_name = attachment.get("name") or f"{vpc_id}-{tgw_name}"
-            subnet_names = attachment.get("subnets", [])
-
-            # Map subnet names in the attachment to our constructed subnet IDs
-            attachment_subnet_ids = [
-                f"{vpc_id}-{sn}" if vpc_id and sn else sn for sn in subnet_names
-            ]
+    # ---- VPCs & Subnets ----
+    vpc_cfgs = [vpc for vpc in network_cfg.get("vpcs", []) if isinstance(vpc, dict)]
+    default_region = network_cfg.get("region", None)
+    results = [process_vpc(vpc, default_region) for vpc in vpc_cfgs]
 
-            tgw_attachments.append(
-                {
-                    "id": f"{vpc_id}-{tgw_name}" if vpc_id and tgw_name else att_name,
-                    "tgw_id": tgw_name,
-                    "vpc_id": vpc_id,
-                    "name": att_name,
-                    "subnets": attachment_subnet_ids,
-                    "route_tables": {
-                        "tgw_association": attachment.get("routeTableAssociations"),
-                        "tgw_propagations": attachment.get(
-                            "routeTablePropagations", []
-                        ),
-                    },
-                }
-            )
+    vpcs = [vpc_record for vpc_record, _ in results]
+    tgw_attachments = [att for _, attachments in results for att in attachments]
+    for vpc_record in vpcs:
+        intern_vpc_strings(vpc_record)
 
     # ---- Direct Connect Gateways ----
     dx_gateways = []
@@ -235,19 +493,19 @@ def extract_network_graph(network_cfg: dict) -> dict:
             continue
 
         dxgw_name = dxgw.get("name")
-        dx_entry = {
-            "id": dxgw_name,
-            "name": dxgw_name,
-            "account": dxgw.get("account"),
-            "asn": dxgw.get("asn"),
-            "virtual_interfaces": [],
-            "tgw_associations": [],
-        }
+        dx_entry = DxGateway(
+            id=dxgw_name,
+            name=dxgw_name,
+            account=intern_str(dxgw.get("account")),
+            asn=dxgw.get("asn"),
+            virtual_interfaces=[],
+            tgw_associations=[],
+        )
 
         for vif in dxgw.get("virtualInterfaces", []):
             if not isinstance(vif, dict):
                 continue
-            dx_entry["virtual_interfaces"].append(
+            dx_entry.virtual_interfaces.append(
                 {
                     "id": vif.get("name"),
                     "name": vif.get("name"),
@@ -263,7 +521,7 @@ def extract_network_graph(network_cfg: dict) -> dict:
         for assoc in dxgw.get("transitGatewayAssociations", []):
             if not isinstance(assoc, dict):
                 continue
-            dx_entry["tgw_associations"].append(
+            dx_entry.tgw_associations.append(
                 {
                     "tgw_name": assoc.get("name"),
                     "account": assoc.get("account"),
@@ -288,42 +546,19 @@ def extract_network_graph(network_cfg: dict) -> dict:
             if not isinstance(vpn, dict):
                 continue
             vpn_connections.append(
-                {
-                    "name": vpn.get("name"),
-                    "customer_gateway": cgw_name,
-                    "account": cgw.get("account"),
-                    "region": cgw.get("region"),
-                    "transit_gateway": vpn.get("transitGateway"),
-                    "static_routes_only": vpn.get("staticRoutesOnly"),
-                    "route_table_associations": vpn.get("routeTableAssociations", []),
-                    "route_table_propagations": vpn.get("routeTablePropagations", []),
-                    "tunnel_specifications": vpn.get("tunnelSpecifications", []),
-                }
+                VpnConnection(
+                    name=vpn.get("name"),
+                    customer_gateway=cgw_name,
+                    account=intern_str(cgw.get("account")),
+                    region=intern_str(cgw.get("region")),
+                    transit_gateway=vpn.get("transitGateway"),
+                    static_routes_only=vpn.get("staticRoutesOnly"),
+                    route_table_associations=vpn.get("routeTableAssociations", []),
+                    route_table_propagations=vpn.get("routeTablePropagations", []),
+                    tunnel_specifications=vpn.get("tunnelSpecifications", []),
+                )
             )
 
-    # ---- CNFGW Endpoints ----
-    cnfgw_endpoints = []
-    if network_cfg.get("transitGateways"):
-        for tgw in network_cfg.get("transitGateways", []):
-            if not isinstance(tgw, dict):
-                continue
-            for rt in tgw.get("routeTables", []):
-                if not isinstance(rt, dict):
-                    continue
-                for route in rt.get("routes", []):
-                    if not isinstance(route, dict):
-                        continue
-                    target_endpoint = route.get("targetVpcEndpoint")
-                    if target_endpoint and "cnfgw" in target_endpoint.lower():
-                        cnfgw_endpoints.append({
-                            "id": target_endpoint,
-                            "name": target_endpoint,
-                            "tgw": tgw.get("name"),
-                            "route_table": rt.get("name"),
-                            "destination": route.get("destinationCidrBlock") or route.get("destination"),
-                            "type": "palo_alto_cnfgw"
-                        })
-
     graph = {
         "transit_gateways": transit_gateways,
         "vpcs": vpcs,
@@ -336,6 +571,20 @@ def extract_network_graph(network_cfg: dict) -> dict:
     return graph
 
 
+def find_unknown_tgw_attachments(graph: dict) -> list:
+    """
+    Return the TGW attachments in the graph whose transit gateway is not
+    defined in the config's transitGateways.
+    """
+    # Set of names so each attachment is checked in O(1)
+    tgw_names = {tgw.id for tgw in graph["transit_gateways"]}
+    return [
+        att
+        for att in graph["tgw_attachments"]
+        if att.tgw_id and att.tgw_id not in tgw_names
+    ]
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Resolve LZA network-config.yaml with replacements-config.yaml"
@@ -358,17 +607,42 @@ def main():
         type=Path,
         help="Output JSON file (resolved config / graph)",
     )
+    parser.add_argument(
+        "--cache-replacements",
+        action="store_true",
+        help="Cache the parsed replacements next to the YAML as *.cache.json "
+        "and reuse it while the YAML is unchanged",
+    )
+    parser.add_argument(
+        "--no-resolved-config",
+        action="store_true",
+        help="Only write the graph; omit resolved_network_config from the output",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write JSON without indentation (smaller and faster to write)",
+    )
     args = parser.parse_args()
 
     # 1) Load replacements-config.yaml and build the key->value map
-    replacements_raw = load_yaml(args.replacements)
-    repl_map = build_replacements(replacements_raw)
+    if args.cache_replacements:
+        repl_map = load_replacements_cached(args.replacements)
+    else:
+        replacements_raw = load_yaml(args.replacements)
+        repl_map = build_replacements(replacements_raw)
 
     # 2) Render network-config.yaml as text with replacements applied, then parse YAML
     network_resolved = render_network_config(args.network, repl_map)
 
     # 3) Build the network graph from the resolved config
     graph = extract_network_graph(network_resolved)
+    for att in find_unknown_tgw_attachments(graph):
+        print(
+            f"Warning: VPC {att.vpc_id} attaches to unknown transit gateway "
+            f"{att.tgw_id}",
+            file=sys.stderr,
+        )
 
     # 4) Build final output
     output = {
@@ -376,12 +650,28 @@ def main():
             "generated_at": datetime.now(timezone.utc).isoformat(),
         },
         "graph": graph,
-        "resolved_network_config": network_resolved,
     }
-
-    # 5) Write JSON output
-    with args.out.open("w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2)
+    if not args.no_resolved_config:
+        output["resolved_network_config"] = network_resolved
+
+    # 5) Write JSON output (--compact skips indentation; either form loads the same)
+    # orjson writes non-ASCII text as raw UTF-8 (json uses \uXXXX escapes) and
+    # serializes YAML dates as ISO strings (json raises TypeError on them)
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if not args.compact:
+            option |= orjson.OPT_INDENT_2
+        args.out.write_bytes(orjson.dumps(output, option=option))
+    else:
+        with args.out.open("w", encoding="utf-8") as f:
+            if args.compact:
+                # Only json.dumps (not json.dump) uses the C encoder, and only
+                # without indent
+                f.write(
+                    json.dumps(output, separators=(",", ":"), default=record_to_dict)
+                )
+            else:
+                json.dump(output, f, indent=2, default=record_to_dict)
 
     print(f"Wrote resolved network graph to {args.out}")
 